@@ -1,67 +1,335 @@
 import os
-import sys
-import subprocess
-import tempfile
-import json
+
+# `PROD=1 python app.py` hands the process to gunicorn (one worker per
+# core, see gunicorn_conf.py) before the heavy imports below. Paths are
+# resolved from this file so it works from any working directory.
+if __name__ == '__main__' and os.environ.get('PROD') == '1':
+    _here = os.path.dirname(os.path.abspath(__file__))
+    os.execvp('gunicorn', ['gunicorn', '-c', os.path.join(_here, 'gunicorn_conf.py'),
+                           '--chdir', _here, 'app:app'])
+
 import re
 import networkx as nx
 import concurrent.futures
 import time
 import threading
-from flask import Flask, render_template, request, jsonify
+import queue
+import asyncio
+import shutil
+import uuid
+import hashlib
+from collections import defaultdict, namedtuple
+from flask import Flask, request, send_file, send_from_directory
+from flask_compress import Compress
+from asgiref.wsgi import WsgiToAsgi
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import base64
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import features as pil_features
+import html
 from io import BytesIO
-import requests
+import aiohttp
+import diskcache
+import orjson
 from functools import lru_cache
+from packaging.version import Version, InvalidVersion
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.utils import canonicalize_name
+from utils.layout_kernel import NUMBA_AVAILABLE, force_directed_layout
 
 app = Flask(__name__)
-cache = {}  # Simple in-memory cache
+# Compress text responses (page, assets, JSON, SVG graphs), preferring
+# brotli and falling back to gzip for clients that don't accept it
+app.config['COMPRESS_MIMETYPES'] = ['text/html', 'text/css', 'application/javascript',
+                                    'text/javascript', 'application/json', 'image/svg+xml']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+# Static files are streamed, and flask-compress can't stream gzip
+app.config['COMPRESS_ALGORITHM_STREAMING'] = ['br', 'deflate']
+# Streamed responses only answer If-None-Match with a 304 for these
+# endpoints; the page is streamed too, so it needs listing next to static
+app.config['COMPRESS_STREAMING_ENDPOINT_CONDITIONAL'] = ['static', 'index']
+Compress(app)
+
+def jresp(obj):
+    """JSON response encoded with orjson, which is much faster than jsonify."""
+    return app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    # A plain static file: Flask adds ETag/Last-Modified, so reloads get a 304
+    return send_from_directory(app.static_folder, 'index.html', max_age=3600)
 
-def parse_dependencies(requirements_text):
-    """Parse requirements text into list of package names and versions."""
-    packages = []
-    for line in requirements_text.strip().split('\n'):
-        # Skip comments and empty lines
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        
-        packages.append(line)
-    
-    return packages
+# One stripped requirement line per match; blank lines and lines starting
+# with '#' never match
+_REQ_LINE_RE = re.compile(r'^\s*([^#\s].*?)\s*$', re.M)
 
-@lru_cache(maxsize=100)
-def get_package_metadata(package_name):
+def parse_dependencies(requirements_text):
     """
-    Get package metadata from PyPI.
-    This is much faster than using pip commands.
+    Parse requirements text into a list of requirement lines (package
+    names and versions).
     """
+    return _REQ_LINE_RE.findall(requirements_text)
+
+# Matches "name[extras] <op> version" in a single pass
+_SPEC_RE = re.compile(r'^\s*([A-Za-z0-9_.\-]+)\s*(?:\[[^\]]*\])?\s*(==|>=|<=|~=|>|<)?\s*(\S+)?')
+
+@lru_cache(maxsize=4096)
+def parse_req(req):
+    """Split a requirement string into (package name, version operator, version)."""
+    m = _SPEC_RE.match(req)
+    if not m:
+        return req.strip(), None, None
+    return m.groups()
+
+def parse_reqs(requirements):
+    """Parse a list of requirement strings into (name, spec, version) tuples."""
+    return [parse_req(req) for req in requirements]
+
+PYPI_JSON_URL = "https://pypi.org/pypi/{}/json"
+USER_AGENT = 'python-dependency-checker (+https://github.com/priyankvadaliya/python-dependency-checker)'
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# The only parts of a PyPI JSON document the checker uses. Keeping this
+# instead of the full response (every release and file URL) keeps the
+# caches small.
+PkgMeta = namedtuple('PkgMeta', ['requires_dist', 'latest_version', 'release_versions'])
+
+# Returned (and compared by identity) when PyPI could not be reached or kept
+# failing, so a timeout is not reported as a package that does not exist.
+LOOKUP_FAILED = PkgMeta((), '', frozenset())
+
+def _project_metadata(content):
+    """Parse a raw PyPI JSON response body into a PkgMeta."""
+    data = orjson.loads(content)
+    info = data.get('info') or {}
+    return PkgMeta(
+        tuple(info.get('requires_dist') or ()),
+        info.get('version', ''),
+        frozenset(data.get('releases') or ())
+    )
+
+# On-disk PyPI response cache shared across processes and restarts.
+# Entries hold plain tuples, not PkgMeta: a pickled PkgMeta names the module
+# that defined it, which is __main__ under `python app.py` and unloadable
+# from gunicorn or `flask run`.
+_DISK_CACHE = diskcache.Cache('./.pypi_cache')
+CACHE_TTL = 3600  # seconds before an entry is revalidated
+CACHE_RETENTION = 7 * 24 * 3600  # seconds a stale entry is kept for revalidation
+
+# Caps concurrent PyPI requests to stay under rate limits
+PYPI_CONCURRENCY = 20
+
+def _cached_entry(package_name):
+    """Return (cache_key, entry, is_fresh) for a package in the disk cache."""
+    cache_key = ('pkgmeta', package_name)
     try:
-        response = requests.get(f"https://pypi.org/pypi/{package_name}/json", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        return None
+        cached = _DISK_CACHE.get(cache_key)
+        if cached:
+            cached = dict(cached, data=PkgMeta(*cached['data']))
     except Exception:
+        cached = None  # Unreadable or outdated entry: treat it as a miss
+    return cache_key, cached, bool(cached and cached['ts'] + CACHE_TTL > time.time())
+
+def _write_entry(cache_key, entry):
+    _DISK_CACHE.set(cache_key, dict(entry, data=tuple(entry['data'])), expire=CACHE_RETENTION)
+
+def _revalidation_headers(cached):
+    """Conditional request headers for a stale cache entry."""
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    return headers
+
+def _store_response(cache_key, cached, status, headers, content):
+    """Turn a PyPI response into a PkgMeta, updating the disk cache."""
+    if status == 304 and cached:
+        cached['ts'] = time.time()
+        _write_entry(cache_key, cached)
+        return cached['data']
+    if status == 200:
+        data = _project_metadata(content)
+        _write_entry(cache_key, {
+            'ts': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'data': data
+        })
+        return data
+    if status == 404:
         return None
+    return cached['data'] if cached else LOOKUP_FAILED
 
-def extract_requirements_from_metadata(metadata):
-    """Extract requirements from PyPI metadata."""
-    if not metadata or 'info' not in metadata:
-        return []
+# PyPI lookups currently in flight, keyed by package name. Concurrent
+# callers asking for the same package wait on the first caller's future
+# instead of issuing their own request.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _claim(names):
+    """Split names into ({name: future} to fetch, {name: future} to wait on)."""
+    owned = {}
+    waiting = {}
+    with _inflight_lock:
+        for name in names:
+            future = _inflight.get(name)
+            if future is None:
+                owned[name] = _inflight[name] = concurrent.futures.Future()
+            else:
+                waiting[name] = future
+    return owned, waiting
+
+def _complete(name, future, result):
+    """Publish a fetched result to waiters and retire the in-flight entry."""
+    with _inflight_lock:
+        _inflight.pop(name, None)
+    future.set_result(result)
+
+# Whole analyses in flight, keyed by a hash of the request. Identical
+# concurrent requests wait on the first one's future; a finished result
+# stays shared for REQUEST_COALESCE_TTL seconds to catch stragglers.
+REQUEST_COALESCE_TTL = 2  # seconds
+_request_inflight = {}
+_request_inflight_lock = threading.Lock()
+
+def _claim_request(key):
+    """Return (future, owned); the caller computes the result if owned."""
+    now = time.monotonic()
+    with _request_inflight_lock:
+        for stale_key in [k for k, (_, expires) in _request_inflight.items() if expires is not None and expires < now]:
+            del _request_inflight[stale_key]
+        if key in _request_inflight:
+            return _request_inflight[key][0], False
+        future = concurrent.futures.Future()
+        _request_inflight[key] = (future, None)
+        return future, True
+
+def _finish_request(key, future, result=None, error=None):
+    """Publish an analysis to waiters; failures are not kept for later requests."""
+    with _request_inflight_lock:
+        if error is None:
+            _request_inflight[key] = (future, time.monotonic() + REQUEST_COALESCE_TTL)
+        else:
+            _request_inflight.pop(key, None)
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+async def fetch_meta(session, package_name, retries=3):
+    """
+    Get package metadata from PyPI as a PkgMeta.
+    Responses are cached on disk for CACHE_TTL seconds; stale entries are
+    revalidated with ETag/Last-Modified so an unchanged package costs a 304.
+    """
+    cache_key, cached, fresh = _cached_entry(package_name)
+    if fresh:
+        return cached['data']
     
-    requires_dist = metadata['info'].get('requires_dist', [])
-    if not requires_dist:
+    try:
+        for attempt in range(retries + 1):
+            async with session.get(PYPI_JSON_URL.format(package_name),
+                                   headers=_revalidation_headers(cached)) as response:
+                if response.status in RETRY_STATUSES and attempt < retries:
+                    await asyncio.sleep(0.3 * 2 ** attempt)
+                    continue
+                content = await response.read()
+                return _store_response(cache_key, cached, response.status, response.headers, content)
+    except Exception:
+        return cached['data'] if cached else LOOKUP_FAILED
+
+# Flask runs every async view on a fresh event loop, so the PyPI session
+# lives on a loop thread of its own and is shared by the whole process.
+# Timeouts apply per socket operation: time spent queued for one of the
+# PYPI_CONCURRENCY connections does not count against a lookup.
+PYPI_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=10)
+pypi_loop = None
+pypi_thread = None
+_pypi_session = None
+_pypi_loop_lock = threading.Lock()
+
+def _ensure_pypi_loop():
+    # Started lazily, like the render thread, so each gunicorn worker
+    # gets its own loop and session
+    global pypi_loop, pypi_thread, _pypi_session
+    with _pypi_loop_lock:
+        if pypi_thread is None or not pypi_thread.is_alive():
+            pypi_loop = asyncio.new_event_loop()
+            _pypi_session = None
+            pypi_thread = threading.Thread(target=pypi_loop.run_forever, name='pypi-session', daemon=True)
+            pypi_thread.start()
+        return pypi_loop
+
+def _session():
+    """The process-wide PyPI session; only called on pypi_loop."""
+    global _pypi_session
+    if _pypi_session is None:
+        connector = aiohttp.TCPConnector(limit=PYPI_CONCURRENCY, ttl_dns_cache=300)
+        _pypi_session = aiohttp.ClientSession(connector=connector, timeout=PYPI_TIMEOUT,
+                                              headers={'User-Agent': USER_AGENT})
+    return _pypi_session
+
+async def _fetch_many(names):
+    session = _session()
+    return await asyncio.gather(*(fetch_meta(session, name) for name in names))
+
+async def gather_all(names):
+    """
+    Fetch metadata for many packages concurrently over the shared session.
+    Packages another request is already fetching are awaited, not refetched.
+    """
+    owned, waiting = _claim(names)
+    results = {}
+    try:
+        if owned:
+            fetched = await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(_fetch_many(list(owned)), _ensure_pypi_loop()))
+            for (name, future), metadata in zip(owned.items(), fetched):
+                results[name] = metadata
+                _complete(name, future, metadata)
+    finally:
+        # Never leave waiters hanging if the fetch was cancelled or failed
+        for name, future in owned.items():
+            if not future.done():
+                _complete(name, future, LOOKUP_FAILED)
+    
+    for name, future in waiting.items():
+        results[name] = await asyncio.wrap_future(future)
+    
+    return [results[name] for name in names]
+
+# Conflict checks are CPU-only, so they get a long-lived pool of their own
+_CPU_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix='conflict-check')
+
+def _split_cached(names):
+    """Split names into ({name: metadata} fresh from cache, [names to fetch])."""
+    metas = {}
+    missing = []
+    for name in dict.fromkeys(names):
+        _, cached, fresh = _cached_entry(name)
+        if fresh:
+            metas[name] = cached['data']
+        else:
+            missing.append(name)
+    return metas, missing
+
+async def prefetch_all_async(names):
+    """Fetch PyPI metadata for all package names in one concurrent pass."""
+    metas, missing = _split_cached(names)
+    if missing:
+        metas.update(zip(missing, await gather_all(missing)))
+    return metas
+
+def extract_requirements_from_metadata(metadata):
+    """Extract requirements from a PkgMeta."""
+    if not metadata or not metadata.requires_dist:
         return []
     
     requirements = []
-    for req in requires_dist:
+    for req in metadata.requires_dist:
         # Parse requirement string
         if ";" in req:  # Has environment markers
             req_name = req.split(";")[0].strip()
@@ -74,35 +342,50 @@ def extract_requirements_from_metadata(metadata):
     
     return requirements
 
-def check_package_conflict(req, all_requirements):
-    """Check if a single package has conflicts with other requirements."""
+@lru_cache(maxsize=4096)
+def _ver(version):
+    """Parse a version string once; returns None if it is not PEP 440."""
+    try:
+        return Version(version)
+    except (InvalidVersion, TypeError):
+        return None
+
+def _is_released(version, metadata):
+    """True if PyPI lists the version, comparing as PEP 440 versions (2.2 == 2.2.0)."""
+    if version in metadata.release_versions:
+        return True
+    parsed = _ver(version)
+    return parsed is not None and any(_ver(release) == parsed for release in metadata.release_versions)
+
+@lru_cache(maxsize=1024)
+def _requirement(dep):
+    """Parse a dependency string once; returns None if it is not PEP 508."""
+    try:
+        return Requirement(dep)
+    except InvalidRequirement:
+        return None
+
+def check_package_conflict(req, index, metas):
+    """
+    Check if a single package has conflicts with other requirements.
+    `index` maps canonical package names to their parsed (req, spec, version) entries.
+    """
     conflicts = []
     suggestions = []
     
     # Extract package name and version
-    package_name = req.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].split('~=')[0].strip()
-    version_spec = None
-    if '==' in req:
-        version_spec = '=='
-        version = req.split('==')[1]
-    elif '>=' in req:
-        version_spec = '>='
-        version = req.split('>=')[1]
-    elif '<=' in req:
-        version_spec = '<='
-        version = req.split('<=')[1]
-    elif '>' in req:
-        version_spec = '>'
-        version = req.split('>')[1]
-    elif '<' in req:
-        version_spec = '<'
-        version = req.split('<')[1]
-    elif '~=' in req:
-        version_spec = '~='
-        version = req.split('~=')[1]
+    package_name, version_spec, version = parse_req(req)
     
     # Check if package exists
-    metadata = get_package_metadata(package_name)
+    metadata = metas.get(package_name)
+    if metadata is LOOKUP_FAILED:
+        conflicts.append({
+            'package': package_name,
+            'error': f"Could not reach PyPI to look up '{package_name}'",
+            'type': 'lookup_failed',
+            'suggestion': "PyPI timed out or returned an error; try again shortly"
+        })
+        return conflicts, suggestions
     if not metadata:
         conflicts.append({
             'package': package_name,
@@ -114,7 +397,7 @@ def check_package_conflict(req, all_requirements):
     
     # Check if the specified version exists
     if version_spec == '==' and version:
-        if version not in metadata.get('releases', {}):
+        if not _is_released(version, metadata):
             conflicts.append({
                 'package': package_name,
                 'error': f"Version {version} not found for package '{package_name}'",
@@ -123,28 +406,29 @@ def check_package_conflict(req, all_requirements):
             })
             
             # Suggest the latest version
-            latest_version = metadata['info'].get('version')
+            latest_version = metadata.latest_version
             if latest_version:
                 suggestions.append(f"{package_name}=={latest_version}")
             
             return conflicts, suggestions
     
-    # Get package dependencies
-    dependencies = extract_requirements_from_metadata(metadata)
-    
-    # Check for conflicts with other requirements
-    for other_req in all_requirements:
+    # Check for duplicate package with different version
+    for other_req, other_spec, other_version in index.get(canonicalize_name(package_name), ()):
         if other_req == req:
             continue
         
-        other_package = other_req.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].split('~=')[0].strip()
-        
-        # Check for duplicate package with different version
-        if other_package == package_name and '==' in other_req and '==' in req:
-            this_version = req.split('==')[1]
-            other_version = other_req.split('==')[1]
+        if other_spec == '==' and version_spec == '==':
+            this_version = version
             
-            if this_version != other_version:
+            # Compare as PEP 440 versions (2.2 == 2.2.0), or as text when
+            # either doesn't parse
+            this_parsed, other_parsed = _ver(this_version), _ver(other_version)
+            if this_parsed is not None and other_parsed is not None:
+                different = this_parsed != other_parsed
+            else:
+                different = this_version != other_version
+            
+            if different:
                 conflicts.append({
                     'package': package_name,
                     'error': f"Duplicate package '{package_name}' with different versions: {this_version} and {other_version}",
@@ -152,80 +436,80 @@ def check_package_conflict(req, all_requirements):
                     'suggestion': f"Use only one version or use a compatible version specifier like {package_name}~={this_version}"
                 })
                 
-                # Suggest using the newer version
-                versions = [this_version, other_version]
-                versions.sort(reverse=True)  # Simple version sort, not semantic
-                suggestions.append(f"{package_name}=={versions[0]}")
-    
-    # For each dependency, check if it conflicts with other requirements
-    for dep in dependencies:
-        dep_name = dep.split(' ')[0]
+                # Suggest using the newer of the two versions that exist
+                released = [v for v in (this_version, other_version) if _is_released(v, metadata)]
+                if released:
+                    newest = max(released, key=lambda v: (_ver(v) is not None, _ver(v) or v))
+                    suggestions.append(f"{package_name}=={newest}")
+    
+    # For each dependency, check if it conflicts with other requirements.
+    # Dependencies gated on an extra or a marker that doesn't hold here
+    # are not installed by a plain install, so they can't conflict.
+    for raw_dep in metadata.requires_dist:
+        dep_req = _requirement(raw_dep)
+        if dep_req is None or not dep_req.specifier:
+            continue
+        if dep_req.marker is not None and not dep_req.marker.evaluate({'extra': ''}):
+            continue
+        dep_name = dep_req.name
+        dep = f"{dep_name}{dep_req.specifier}"
         
-        for other_req in all_requirements:
-            other_package = other_req.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].split('~=')[0].strip()
+        for other_req, other_spec, other_version in index.get(canonicalize_name(dep_name), ()):
+            if other_spec != '==':
+                continue
             
-            if other_package == dep_name:
-                # This is a potential conflict, check versions
-                # Note: This is a simplified check and could be enhanced with proper version parsing
-                if '==' in other_req and ('<' in dep or '>' in dep):
-                    other_version = other_req.split('==')[1]
-                    
-                    # Simple check for version conflicts
-                    if ('<' in dep and other_version >= dep.split('<')[1].strip()) or \
-                       ('>' in dep and other_version <= dep.split('>')[1].strip()):
-                        conflicts.append({
-                            'package': package_name,
-                            'error': f"{package_name} requires {dep}, but found {other_req}",
-                            'type': 'dependency_conflict',
-                            'suggestion': f"Adjust {other_package} version to be compatible with {dep}"
-                        })
-                        
-                        # Suggest a compatible version
-                        if '<' in dep:
-                            version = dep.split('<')[1].strip()
-                            major, minor = version.split('.')[:2]
-                            suggested_version = f"{major}.{str(int(minor) - 1)}"
-                            suggestions.append(f"{other_package}<{version}")
-                        elif '>' in dep:
-                            version = dep.split('>')[1].strip()
-                            major, minor = version.split('.')[:2]
-                            suggested_version = f"{major}.{str(int(minor) + 1)}"
-                            suggestions.append(f"{other_package}>{version}")
+            other_parsed = _ver(other_version)
+            if other_parsed is not None and not dep_req.specifier.contains(other_parsed, prereleases=True):
+                conflicts.append({
+                    'package': package_name,
+                    'error': f"{package_name} requires {dep}, but found {other_req}",
+                    'type': 'dependency_conflict',
+                    'suggestion': f"Adjust {dep_name} version to be compatible with {dep}"
+                })
+                
+                # Suggest a compatible version
+                suggestions.append(dep)
     
     return conflicts, suggestions
 
-def detect_conflicts_parallel(requirements):
+def detect_conflicts_parallel(requirements, metas):
     """
     Analyze requirements for conflicts using parallel processing.
     """
     all_conflicts = []
     all_suggestions = []
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(10, len(requirements))) as executor:
-        # Submit all tasks
-        future_to_req = {
-            executor.submit(check_package_conflict, req, requirements): req 
-            for req in requirements
-        }
-        
-        # Process results as they complete
-        for future in concurrent.futures.as_completed(future_to_req):
-            conflicts, suggestions = future.result()
-            all_conflicts.extend(conflicts)
-            all_suggestions.extend(suggestions)
+    # Index parsed requirements by package name for O(1) lookups
+    parsed = parse_reqs(requirements)
+    index = defaultdict(list)
+    for req, (name, spec, version) in zip(requirements, parsed):
+        index[canonicalize_name(name)].append((req, spec, version))
+    
+    # Lines that parse identically (e.g. pasted twice) give identical
+    # results, so check each distinct requirement only once
+    unique = dict(zip(parsed, requirements))
+    
+    # Submit all tasks
+    futures = [_CPU_POOL.submit(check_package_conflict, req, index, metas) for req in unique.values()]
+    
+    # Process results as they complete
+    for future in concurrent.futures.as_completed(futures):
+        conflicts, suggestions = future.result()
+        all_conflicts.extend(conflicts)
+        all_suggestions.extend(suggestions)
     
     return all_conflicts, all_suggestions
 
-def get_limited_dependency_tree(requirements, max_depth=2):
+def get_limited_dependency_tree(requirements, metas, max_depth=2):
     """Generate a simplified dependency tree for visualization."""
     tree_data = []
     
     for req in requirements:
-        package_name = req.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].split('~=')[0].strip()
+        package_name = parse_req(req)[0]
         
-        # Get package metadata
-        metadata = get_package_metadata(package_name)
-        if not metadata:
+        # Metadata was already fetched by prefetch_all_async
+        metadata = metas.get(package_name)
+        if not metadata or metadata is LOOKUP_FAILED:
             continue
         
         # Create package node
@@ -248,88 +532,375 @@ def get_limited_dependency_tree(requirements, max_depth=2):
     return tree_data
 
 def create_dependency_graph(dependency_tree):
-    """Create a NetworkX graph from dependency tree data."""
+    """
+    Create a NetworkX graph from dependency tree data.
+    Graphs are cached by their canonical (package, dependencies) key and
+    shared between callers, so the result must be treated as read-only.
+    """
+    tree_key = tuple(sorted(
+        (package_info['package_name'],
+         tuple(sorted(dependency['package_name'] for dependency in package_info.get('dependencies', ()))))
+        for package_info in dependency_tree
+    ))
+    return _build_graph(tree_key)
+
+@lru_cache(maxsize=256)
+def _build_graph(tree_key):
+    """Build the graph for a canonical dependency tree key."""
     G = nx.DiGraph()
     
-    # Add all packages as nodes
-    for package_info in dependency_tree:
-        package_name = package_info['package_name']
-        G.add_node(package_name)
-        
-        # Add dependencies as edges
-        for dependency in package_info.get('dependencies', []):
-            dependency_name = dependency['package_name']
-            G.add_node(dependency_name)
-            G.add_edge(package_name, dependency_name)
+    # Add all packages as nodes, then their dependencies as edges in bulk
+    # (add_edges_from adds the dependency nodes implicitly)
+    G.add_nodes_from(package_name for package_name, _ in tree_key)
+    G.add_edges_from((package_name, dependency_name)
+                     for package_name, dependency_names in tree_key
+                     for dependency_name in dependency_names)
     
     return G
 
-def plot_dependency_graph(G):
-    """Plot the dependency graph and return it as a base64 encoded image."""
-    plt.figure(figsize=(12, 8))
+# Above this size graphviz's multilevel sfdp is preferred when installed.
+# Otherwise cyclic graphs use the numba force-directed kernel; without
+# numba, spring_layout (pure Python, O(N^2) per step) is only used up to
+# this size and the O(N) circular layout beyond it.
+MAX_SPRING_LAYOUT_NODES = 50
+GRAPHVIZ_AVAILABLE = shutil.which('sfdp') is not None
+
+@lru_cache(maxsize=512)
+def _layout(nodes, edges):
+    """
+    Compute node positions for a graph given as frozensets of nodes and
+    edges, choosing the layout by graph shape and size. Positions are
+    cached per topology and shared between the PNG and SVG renderers, so
+    the result must be treated as read-only.
+    """
+    G = _graph_from_sets(nodes, edges)
+    if G.number_of_nodes() <= 1:
+        return {node: (0.0, 0.0) for node in G}  # Nothing to lay out
+    
+    # Dependency graphs are usually DAGs: give each topological generation
+    # its own concentric shell (O(V+E) and deterministic). Only graphs with
+    # cycles fall through to the force-directed layouts.
+    try:
+        return nx.shell_layout(G, nlist=list(nx.topological_generations(G)))
+    except nx.NetworkXUnfeasible:
+        pass
+    
+    if G.number_of_nodes() > MAX_SPRING_LAYOUT_NODES and GRAPHVIZ_AVAILABLE:
+        try:
+            from networkx.drawing.nx_pydot import graphviz_layout
+            return graphviz_layout(G, prog='sfdp')
+        except Exception:
+            pass  # Fall back to the layouts below
+    if NUMBA_AVAILABLE:
+        return force_directed_layout(list(G.nodes()), list(G.edges()))  # Seeded, so reproducible
+    if G.number_of_nodes() <= MAX_SPRING_LAYOUT_NODES:
+        return nx.spring_layout(G, seed=42)  # For reproducibility
+    return nx.circular_layout(G)
+
+def _figure_geometry(node_count):
+    """Scale the canvas with the graph, capped to bound the PNG size."""
+    width = min(12, 8 + node_count / 10)
+    dpi = 100 if node_count <= MAX_SPRING_LAYOUT_NODES else 80
+    return (width, width * 2 / 3), dpi
+
+def _graph_from_sets(nodes, edges):
+    """Rebuild a graph from frozensets of nodes and edges."""
+    G = nx.DiGraph()
+    G.add_nodes_from(sorted(nodes))  # Stable order keeps the layout reproducible
+    G.add_edges_from(sorted(edges))
+    return G
+
+# One standalone Agg figure per thread (no pyplot global state), reused
+# across renders to avoid reallocating its backing buffer every time
+_figure_local = threading.local()
+
+def _thread_figure():
+    if not hasattr(_figure_local, 'figure'):
+        fig = Figure()
+        _figure_local.figure = (fig, FigureCanvasAgg(fig), fig.add_subplot(111))
+    return _figure_local.figure
+
+# Raster output favours payload size and encode speed over sharpness
+IMAGE_DPI = 72
+IMAGE_SAVE_OPTIONS = {
+    'png': {'compress_level': 1},
+    'webp': {'method': 0},
+}
+WEBP_AVAILABLE = pil_features.check('webp')
+
+@lru_cache(maxsize=256)
+def _render_graph(nodes, edges, image_format='png'):
+    """Render a graph given as frozensets of nodes and edges (cached)."""
+    G = _graph_from_sets(nodes, edges)
+    
+    # Draw on the thread's reusable Agg figure, resized for this graph
+    figsize, _ = _figure_geometry(G.number_of_nodes())
+    fig, canvas, ax = _thread_figure()
+    fig.set_dpi(IMAGE_DPI)
+    fig.set_size_inches(figsize)
+    # clear() keeps the axis and tick settings nx.draw changed last time
+    ax.clear()
+    ax.set_axis_on()
+    ax.tick_params(which='both', bottom=True, left=True, labelbottom=True, labelleft=True)
     
     if len(G.nodes()) > 0:
-        pos = nx.spring_layout(G, seed=42)  # For reproducibility
-        nx.draw(G, pos, with_labels=True, node_color='skyblue', node_size=1500, 
+        pos = _layout(nodes, edges)
+        nx.draw(G, pos, ax=ax, with_labels=True, node_color='skyblue', node_size=1500, 
                font_size=10, font_weight='bold', arrows=True, arrowsize=15)
     else:
-        plt.text(0.5, 0.5, "No dependencies to visualize", 
-                 horizontalalignment='center', verticalalignment='center',
-                 fontsize=14)
+        ax.text(0.5, 0.5, "No dependencies to visualize", 
+                horizontalalignment='center', verticalalignment='center',
+                fontsize=14, transform=ax.transAxes)
     
     # Save the plot to a BytesIO object
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    image_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return image_data
+    fig.savefig(buffer, format=image_format, dpi=IMAGE_DPI, bbox_inches='tight',
+                pil_kwargs=IMAGE_SAVE_OPTIONS[image_format])
+    return buffer.getvalue()
+
+# Matplotlib renders are funnelled through one thread. It collects requests
+# for up to RENDER_BATCH_WAIT seconds and draws each distinct graph once.
+RENDER_BATCH_SIZE = 16
+RENDER_BATCH_WAIT = 0.02  # seconds
+render_queue = queue.Queue()
+render_thread = None
+_render_thread_lock = threading.Lock()
+
+def _render_worker():
+    while True:
+        batch = [render_queue.get()]
+        deadline = time.monotonic() + RENDER_BATCH_WAIT
+        while len(batch) < RENDER_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(render_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        # Identical graphs in the batch share a single render
+        waiting = defaultdict(list)
+        for key, future in batch:
+            waiting[key].append(future)
+        for key, futures in waiting.items():
+            try:
+                result = _render_graph(*key)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(result)
+
+def _ensure_render_thread():
+    # Started lazily: a thread started before gunicorn forks does not
+    # exist in the workers
+    global render_thread
+    with _render_thread_lock:
+        if render_thread is None or not render_thread.is_alive():
+            render_thread = threading.Thread(target=_render_worker, name='graph-render-batch', daemon=True)
+            render_thread.start()
+
+def plot_dependency_graph(G, image_format='png'):
+    """Plot the dependency graph and return the encoded image bytes."""
+    if G.number_of_nodes() == 0:
+        return _EMPTY_GRAPH_IMAGES[image_format]
+    _ensure_render_thread()
+    future = concurrent.futures.Future()
+    render_queue.put(((frozenset(G.nodes()), frozenset(G.edges()), image_format), future))
+    return future.result()
+
+SVG_NODE_RADIUS = 24
+SVG_MARGIN = 60
+
+@lru_cache(maxsize=256)
+def _render_svg(nodes, edges):
+    """Emit SVG markup for a graph given as frozensets of nodes and edges (cached)."""
+    G = _graph_from_sets(nodes, edges)
+    figsize, dpi = _figure_geometry(G.number_of_nodes())
+    width, height = int(figsize[0] * dpi), int(figsize[1] * dpi)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" font-family="sans-serif">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+        'markerHeight="8" orient="auto-start-reverse"><path d="M0,0L10,5L0,10z" fill="#000"/></marker></defs>',
+        f'<rect width="{width}" height="{height}" fill="#fff"/>'
+    ]
+    
+    if G.number_of_nodes() == 0:
+        parts.append(f'<text x="{width / 2}" y="{height / 2}" text-anchor="middle" '
+                     f'dominant-baseline="middle" font-size="18">No dependencies to visualize</text>')
+        parts.append('</svg>')
+        return ''.join(parts)
+    
+    # Scale layout coordinates into the drawing area (SVG y grows downwards)
+    pos = _layout(nodes, edges)
+    xs = [float(p[0]) for p in pos.values()]
+    ys = [float(p[1]) for p in pos.values()]
+    span_x = (max(xs) - min(xs)) or 1
+    span_y = (max(ys) - min(ys)) or 1
+    
+    def to_px(node):
+        x, y = float(pos[node][0]), float(pos[node][1])
+        if len(pos) == 1:
+            return width / 2, height / 2
+        return (SVG_MARGIN + (x - min(xs)) / span_x * (width - 2 * SVG_MARGIN),
+                SVG_MARGIN + (max(ys) - y) / span_y * (height - 2 * SVG_MARGIN))
+    
+    coords = {node: to_px(node) for node in G.nodes()}
+    
+    # Edges stop at the target node's border so the arrowhead stays visible
+    for u, v in G.edges():
+        (x1, y1), (x2, y2) = coords[u], coords[v]
+        length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5 or 1
+        x2 -= (x2 - x1) / length * SVG_NODE_RADIUS
+        y2 -= (y2 - y1) / length * SVG_NODE_RADIUS
+        parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                     f'stroke="#000" marker-end="url(#arrow)"/>')
+    
+    for node, (x, y) in coords.items():
+        label = html.escape(str(node))
+        parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{SVG_NODE_RADIUS}" fill="skyblue"/>'
+                     f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="middle" dominant-baseline="middle" '
+                     f'font-size="12" font-weight="bold">{label}</text>')
+    
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def render_dependency_svg(G):
+    """Render the dependency graph as an SVG string, without matplotlib."""
+    if G.number_of_nodes() == 0:
+        return _EMPTY_GRAPH_SVG
+    return _render_svg(frozenset(G.nodes()), frozenset(G.edges()))
+
+# The "No dependencies to visualize" placeholders are rendered once at import
+_EMPTY_GRAPH_SVG = _render_svg.__wrapped__(frozenset(), frozenset())
+_EMPTY_GRAPH_IMAGES = {image_format: _render_graph.__wrapped__(frozenset(), frozenset(), image_format)
+                       for image_format in IMAGE_SAVE_OPTIONS
+                       if image_format != 'webp' or WEBP_AVAILABLE}
+
+# Warm up the rest of the drawing pipeline (bold label fonts, node and
+# arrow artists) with one throwaway render, so the first request doesn't
+# pay for it. Bypasses the caches and the render thread, which is started
+# per worker.
+try:
+    _render_graph.__wrapped__(frozenset(('a', 'b')), frozenset([('a', 'b')]))
+except Exception:
+    pass
+
+def render_graph(dependency_tree, graph_format='svg'):
+    """
+    Build and render the dependency graph as JSON response fields:
+    'graph_svg' (default) or 'graph' (node-link JSON), or 'graph_error'
+    if rendering failed. Raster images are served as binary instead,
+    see plot_dependency_graph.
+    """
+    try:
+        G = create_dependency_graph(dependency_tree)
+        if graph_format == 'json':
+            return {'graph': nx.node_link_data(G)}
+        return {'graph_svg': render_dependency_svg(G)}
+    except Exception as e:
+        return {'graph_error': str(e)}
 
 @app.route('/check_dependencies', methods=['POST'])
-def check_dependencies():
+async def check_dependencies():
     requirements_text = request.form.get('requirements', '')
     
     # Parse requirements text into list of package names
     requirements = parse_dependencies(requirements_text)
     
     if not requirements:
-        return jsonify({'error': 'No valid packages found in the requirements.'})
+        return jresp({'error': 'No valid packages found in the requirements.'})
     
+    graph_format = request.args.get('format', 'svg')
+    
+    # Identical concurrent checks share a single analysis
+    key = hashlib.sha1('\n'.join([graph_format, *requirements]).encode()).hexdigest()
+    future, owned = _claim_request(key)
+    if not owned:
+        return jresp(await asyncio.wrap_future(future))
+    response_data = None
+    error = None
+    try:
+        response_data = await analyze_requirements(requirements, graph_format)
+    except BaseException as e:
+        # Includes CancelledError on client disconnect or shutdown
+        error = e
+        raise
+    finally:
+        # Always resolve the shared future, or identical requests wait forever
+        _finish_request(key, future, response_data, error)
+    
+    return jresp(response_data)
+
+def _suggestion_rank(suggestion, metadata):
+    """
+    Sort key for suggestions: pins to a released version first, then valid
+    versions, newest first, then by text. Returns None for a pin to a
+    version the package's metadata says was never released.
+    """
+    _, version_spec, version = parse_req(suggestion)
+    released = False
+    if version_spec == '==' and metadata and metadata is not LOOKUP_FAILED:
+        if not _is_released(version, metadata):
+            return None
+        released = True
+    parsed = _ver(version)
+    return released, parsed is not None, parsed, suggestion
+
+async def analyze_requirements(requirements, graph_format='svg'):
+    """Run the full check for parsed requirement lines and build the response data."""
     # Start a background timer to track performance
     start_time = time.time()
     
+    # Fetch PyPI metadata once and share it between both stages
+    names = [name for name, _, _ in parse_reqs(requirements)]
+    metas = await prefetch_all_async(names)
+    
     # Detect conflicts using parallel processing
-    conflicts, suggestions = detect_conflicts_parallel(requirements)
+    conflicts, suggestions = await asyncio.to_thread(detect_conflicts_parallel, requirements, metas)
     
     # Generate a simplified dependency tree
-    dependency_tree = get_limited_dependency_tree(requirements)
-    
-    # Create and plot dependency graph
-    graph_image = None
+    dependency_tree = get_limited_dependency_tree(requirements, metas)
+    
+    # The graph is only rendered once the client asks for it: store the tree
+    # under a job id and let /graph/<graph_job_id> render it on first poll.
+    # By default it is inline SVG; ?format=json gives node-link data, and
+    # ?format=png a binary image served from graph_url.
+    graph_job_id = None
+    graph_url = None
     if dependency_tree:
-        try:
-            G = create_dependency_graph(dependency_tree)
-            graph_image = plot_dependency_graph(G)
-        except Exception as e:
-            return jsonify({'graph_error': str(e)})
+        graph_job_id = create_graph_job(dependency_tree, graph_format)
+        if graph_format == 'png':
+            graph_url = graph_image_url(graph_job_id)
     
     # Generate fixed requirements
     fixed_requirements = []
     applied_suggestions = {}
     
     if conflicts:
-        # Start with original requirements
-        req_dict = {
-            req.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].split('~=')[0].strip(): req
-            for req in requirements
-        }
-        
-        # Apply unique suggestions
+        # Start with original requirements, keyed by canonical name so a
+        # suggestion replaces its line regardless of name casing
+        req_dict = dict(zip(map(canonicalize_name, names), requirements))
+        
+        # Apply one suggestion per package. Conflicts arrive in completion
+        # order, so rank the candidates instead of taking the last one seen:
+        # released pins first, the highest version among them winning.
+        canonical_metas = {canonicalize_name(name): metadata for name, metadata in metas.items()}
+        by_package = defaultdict(list)
         for suggestion in suggestions:
-            pkg_name = suggestion.split('==')[0].split('>=')[0].split('<=')[0].split('>')[0].split('<')[0].split('~=')[0].strip()
-            req_dict[pkg_name] = suggestion
-            applied_suggestions[pkg_name] = suggestion
+            by_package[canonicalize_name(parse_req(suggestion)[0])].append(suggestion)
+        for canonical_name, candidates in by_package.items():
+            metadata = canonical_metas.get(canonical_name)
+            ranked = [(_suggestion_rank(candidate, metadata), candidate) for candidate in candidates]
+            ranked = [entry for entry in ranked if entry[0] is not None]
+            if not ranked:
+                continue  # Every candidate pins a version that doesn't exist
+            suggestion = max(ranked)[1]
+            req_dict[canonical_name] = suggestion
+            applied_suggestions[parse_req(suggestion)[0]] = suggestion
         
         fixed_requirements = list(req_dict.values())
     
@@ -341,868 +912,88 @@ def check_dependencies():
         'requirements': requirements,
         'conflicts': conflicts,
         'dependency_tree': dependency_tree,
-        'graph_image': graph_image,
+        'graph_job_id': graph_job_id,
+        'graph_url': graph_url,
         'fixed_requirements': fixed_requirements if conflicts else [],
         'applied_suggestions': applied_suggestions,
         'execution_time': f"{execution_time:.2f} seconds"
     }
     
-    return jsonify(response_data)
+    return response_data
+
+# Lazy background graph rendering. Jobs and results live in the shared disk
+# cache rather than process memory so any gunicorn worker can answer a poll.
+graph_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='graph-render')
+GRAPH_JOB_TTL = 900  # seconds a graph job, and then its result, is kept
+GRAPH_EXPIRED_ERROR = 'This graph has expired. Check the dependencies again.'
+
+def accepts_webp():
+    """
+    True if the client explicitly lists image/webp (wildcards don't count).
+    Only meaningful on the image request itself: browsers advertise WebP
+    when loading an <img>, not on fetch() calls.
+    """
+    return WEBP_AVAILABLE and any(
+        mimetype.lower() == 'image/webp' and quality > 0 for mimetype, quality in request.accept_mimetypes)
+
+def create_graph_job(dependency_tree, graph_format='svg'):
+    """Store a graph to be rendered on request and return its job id."""
+    job_id = uuid.uuid4().hex
+    _DISK_CACHE.set(('graph_job', job_id), (dependency_tree, graph_format), expire=GRAPH_JOB_TTL)
+    return job_id
+
+def graph_image_url(job_id):
+    return f'/graph/{job_id}/image'
+
+def start_graph_job(job_id, job):
+    """Queue the render for a job unless another request already started it."""
+    # add() is atomic across processes, so only the first poll submits
+    if not _DISK_CACHE.add(('graph_started', job_id), True, expire=GRAPH_JOB_TTL):
+        return
+    dependency_tree, graph_format = job[:2]
+    future = graph_pool.submit(render_graph, dependency_tree, graph_format)
+    future.add_done_callback(
+        lambda f: _DISK_CACHE.set(('graph', job_id), f.result(), expire=GRAPH_JOB_TTL))
+
+@app.route('/graph/<job_id>')
+def graph_result(job_id):
+    result = _DISK_CACHE.get(('graph', job_id))
+    if result is not None:
+        return jresp({'status': 'done', **result})
+    
+    job = _DISK_CACHE.get(('graph_job', job_id))
+    if job is None:
+        return jresp({'status': 'expired', 'graph_error': GRAPH_EXPIRED_ERROR}), 404
+    if job[1] == 'png':
+        # Images are rendered when the browser loads the URL
+        return jresp({'status': 'done', 'graph_url': graph_image_url(job_id)})
+    start_graph_job(job_id, job)
+    return jresp({'status': 'pending'})
+
+def send_graph_image(job_id, image_format):
+    job = _DISK_CACHE.get(('graph_job', job_id))
+    if job is None or image_format not in _EMPTY_GRAPH_IMAGES:
+        return jresp({'graph_error': GRAPH_EXPIRED_ERROR}), 404
+    try:
+        image = plot_dependency_graph(create_dependency_graph(job[0]), image_format)
+    except Exception as e:
+        return jresp({'graph_error': str(e)}), 500
+    return send_file(BytesIO(image), mimetype=f'image/{image_format}', max_age=60)
+
+@app.route('/graph/<job_id>/image')
+def graph_image(job_id):
+    # WebP when the browser's image request asks for it, PNG otherwise
+    response = send_graph_image(job_id, 'webp' if accepts_webp() else 'png')
+    if not isinstance(response, tuple):
+        response.vary.add('Accept')
+    return response
+
+@app.route('/graph/<job_id>.<image_format>')
+def graph_image_as(job_id, image_format):
+    return send_graph_image(job_id, image_format)
+
+# ASGI entry point for ASGI servers, e.g. `uvicorn app:asgi_app --workers 4`
+asgi_app = WsgiToAsgi(app)
 
 if __name__ == '__main__':
-    # Create templates directory if it doesn't exist
-    os.makedirs('templates', exist_ok=True)
-    
-    # Create index.html template
-    with open('templates/index.html', 'w') as f:
-        f.write('''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Python Package Dependency Checker</title>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0-beta3/css/all.min.css">
-    <style>
-        :root {
-            --primary-color: #3f51b5;
-            --primary-light: #757de8;
-            --primary-dark: #002984;
-            --secondary-color: #4caf50;
-            --secondary-light: #80e27e;
-            --secondary-dark: #087f23;
-            --danger-color: #f44336;
-            --warning-color: #ff9800;
-            --info-color: #2196f3;
-            --success-color: #4caf50;
-            --gray-100: #f7f7f7;
-            --gray-200: #eeeeee;
-            --gray-300: #e0e0e0;
-            --gray-400: #bdbdbd;
-            --gray-500: #9e9e9e;
-            --gray-600: #757575;
-            --gray-700: #616161;
-            --gray-800: #424242;
-            --gray-900: #212121;
-            --border-radius: 8px;
-            --box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            --transition: all 0.3s ease;
-        }
-        
-        * {
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }
-        
-        body {
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
-            line-height: 1.6;
-            color: var(--gray-800);
-            background-color: #f5f7fa;
-            margin: 0;
-            padding: 0;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 2rem;
-        }
-        
-        header {
-            background: linear-gradient(135deg, var(--primary-color), var(--primary-dark));
-            color: white;
-            text-align: center;
-            padding: 2rem 1rem;
-            margin-bottom: 2rem;
-            border-radius: var(--border-radius);
-            box-shadow: var(--box-shadow);
-        }
-        
-        h1, h2, h3, h4 {
-            margin-bottom: 1rem;
-            font-weight: 600;
-            line-height: 1.3;
-        }
-        
-        h1 {
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
-        }
-        
-        h2 {
-            font-size: 1.8rem;
-            color: var(--primary-color);
-            border-bottom: 2px solid var(--primary-light);
-            padding-bottom: 0.5rem;
-            margin-top: 2rem;
-        }
-        
-        h3 {
-            font-size: 1.4rem;
-            color: var(--gray-800);
-            margin-top: 1.5rem;
-        }
-        
-        p {
-            margin-bottom: 1rem;
-        }
-        
-        .card {
-            background-color: white;
-            border-radius: var(--border-radius);
-            box-shadow: var(--box-shadow);
-            overflow: hidden;
-            margin-bottom: 2rem;
-            transition: var(--transition);
-        }
-        
-        .card:hover {
-            box-shadow: 0 10px 15px rgba(0, 0, 0, 0.1);
-        }
-        
-        .card-header {
-            background-color: var(--primary-color);
-            color: white;
-            padding: 1rem;
-            font-weight: 600;
-        }
-        
-        .card-body {
-            padding: 1.5rem;
-        }
-        
-        textarea {
-            width: 100%;
-            min-height: 200px;
-            padding: 1rem;
-            margin-bottom: 1rem;
-            border: 1px solid var(--gray-300);
-            border-radius: var(--border-radius);
-            font-family: 'Courier New', monospace;
-            font-size: 0.9rem;
-            transition: var(--transition);
-            resize: vertical;
-        }
-        
-        textarea:focus {
-            outline: none;
-            border-color: var(--primary-color);
-            box-shadow: 0 0 0 2px rgba(63, 81, 181, 0.2);
-        }
-        
-        button {
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            padding: 0.75rem 1.5rem;
-            border: none;
-            border-radius: var(--border-radius);
-            font-weight: 600;
-            cursor: pointer;
-            transition: var(--transition);
-            font-size: 1rem;
-        }
-        
-        .btn-primary {
-            background-color: var(--primary-color);
-            color: white;
-        }
-        
-        .btn-primary:hover {
-            background-color: var(--primary-dark);
-        }
-        
-        .btn-success {
-            background-color: var(--success-color);
-            color: white;
-        }
-        
-        .btn-success:hover {
-            background-color: var(--secondary-dark);
-        }
-        
-        .btn-info {
-            background-color: var(--info-color);
-            color: white;
-        }
-        
-        .btn-info:hover {
-            background-color: #0b7dda;
-        }
-        
-        .btn-sm {
-            padding: 0.5rem 1rem;
-            font-size: 0.875rem;
-        }
-        
-        .btn-icon {
-            margin-right: 0.5rem;
-        }
-        
-        .loading {
-            display: none;
-            text-align: center;
-            margin: 2rem 0;
-        }
-        
-        .loader {
-            display: inline-block;
-            width: 40px;
-            height: 40px;
-            border: 4px solid rgba(63, 81, 181, 0.2);
-            border-radius: 50%;
-            border-top: 4px solid var(--primary-color);
-            animation: spin 1s linear infinite;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .result-section {
-            display: none;
-            animation: fadeIn 0.5s ease;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(10px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        .performance-info {
-            display: flex;
-            align-items: center;
-            background-color: var(--gray-100);
-            padding: 0.75rem 1rem;
-            border-radius: var(--border-radius);
-            margin-bottom: 1.5rem;
-            font-size: 0.9rem;
-            color: var(--gray-700);
-        }
-        
-        .performance-info i {
-            margin-right: 0.5rem;
-            color: var(--primary-color);
-        }
-        
-        .package-list {
-            margin-top: 1rem;
-        }
-        
-        .package {
-            background-color: white;
-            padding: 1rem;
-            margin-bottom: 1rem;
-            border-radius: var(--border-radius);
-            border-left: 4px solid;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-            transition: var(--transition);
-        }
-        
-        .package:hover {
-            box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-        }
-        
-        .package-header {
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .package-name {
-            display: flex;
-            align-items: center;
-        }
-        
-        .package-name i {
-            margin-right: 0.5rem;
-        }
-        
-        .package-type {
-            font-size: 0.75rem;
-            padding: 0.25rem 0.5rem;
-            border-radius: 20px;
-            color: white;
-            background-color: var(--gray-500);
-        }
-        
-        .error-message {
-            font-family: 'Courier New', monospace;
-            font-size: 0.85rem;
-            background-color: var(--gray-100);
-            padding: 0.75rem;
-            border-radius: 4px;
-            margin: 0.5rem 0;
-            white-space: pre-wrap;
-            overflow-x: auto;
-        }
-        
-        .suggestion {
-            background-color: #e3f2fd;
-            border-left: 4px solid var(--info-color);
-            padding: 1rem;
-            margin-top: 0.75rem;
-            border-radius: 4px;
-            position: relative;
-        }
-        
-        .suggestion-header {
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-            display: flex;
-            align-items: center;
-        }
-        
-        .suggestion-header i {
-            margin-right: 0.5rem;
-            color: var(--info-color);
-        }
-        
-        .conflict { border-left-color: var(--danger-color); }
-        .direct_conflict, .duplicate_package { border-left-color: #d32f2f; }
-        .version_conflict, .dependency_conflict { border-left-color: #c62828; }
-        .installation_error, .missing_package, .version_not_found { border-left-color: #d50000; }
-        .system_error { border-left-color: #b71c1c; }
-        .analysis_error { border-left-color: var(--warning-color); }
-        
-        .fixed-requirements {
-            background-color: #e8f5e9;
-            border: 1px dashed var(--success-color);
-            border-radius: var(--border-radius);
-            padding: 1.5rem;
-            margin-top: 1.5rem;
-            position: relative;
-        }
-        
-        .fixed-requirements-header {
-            position: absolute;
-            top: -12px;
-            left: 20px;
-            background-color: white;
-            padding: 0 10px;
-            color: var(--success-color);
-            font-weight: 600;
-            font-size: 0.9rem;
-        }
-        
-        .fixed-requirements-actions {
-            display: flex;
-            justify-content: flex-end;
-            margin-top: 1rem;
-        }
-        
-        .fixed-requirements-actions button {
-            margin-left: 0.5rem;
-        }
-        
-        pre {
-            background-color: var(--gray-100);
-            padding: 1rem;
-            border-radius: 4px;
-            overflow-x: auto;
-            font-family: 'Courier New', monospace;
-            font-size: 0.9rem;
-            margin: 0.5rem 0;
-        }
-        
-        .graph-container {
-            margin-top: 2rem;
-            text-align: center;
-        }
-        
-        .graph-container img {
-            max-width: 100%;
-            border-radius: var(--border-radius);
-            box-shadow: var(--box-shadow);
-            margin-top: 1rem;
-        }
-        
-        .tab-container {
-            margin-top: 2rem;
-        }
-        
-        .tabs {
-            display: flex;
-            border-bottom: 2px solid var(--gray-300);
-            margin-bottom: 1.5rem;
-        }
-        
-        .tab {
-            padding: 0.75rem 1.5rem;
-            cursor: pointer;
-            font-weight: 600;
-            color: var(--gray-600);
-            border-bottom: 2px solid transparent;
-            margin-bottom: -2px;
-            transition: var(--transition);
-        }
-        
-        .tab.active {
-            color: var(--primary-color);
-            border-bottom-color: var(--primary-color);
-        }
-        
-        .tab-content {
-            display: none;
-        }
-        
-        .tab-content.active {
-            display: block;
-            animation: fadeIn 0.3s ease;
-        }
-        
-        .badge {
-            display: inline-flex;
-            align-items: center;
-            padding: 0.25rem 0.5rem;
-            border-radius: 20px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            margin-left: 0.5rem;
-        }
-        
-        .badge-danger {
-            background-color: #ffebee;
-            color: var(--danger-color);
-        }
-        
-        .badge-success {
-            background-color: #e8f5e9;
-            color: var(--success-color);
-        }
-        
-        .badge-info {
-            background-color: #e3f2fd;
-            color: var(--info-color);
-        }
-        
-        .empty-state {
-            text-align: center;
-            padding: 3rem 1rem;
-            color: var(--gray-600);
-        }
-        
-        .empty-state i {
-            font-size: 3rem;
-            margin-bottom: 1rem;
-            color: var(--gray-400);
-        }
-        
-        .tooltip {
-            position: relative;
-            display: inline-block;
-            cursor: help;
-        }
-        
-        .tooltip .tooltip-text {
-            visibility: hidden;
-            width: 200px;
-            background-color: var(--gray-800);
-            color: white;
-            text-align: center;
-            border-radius: 6px;
-            padding: 0.5rem;
-            position: absolute;
-            z-index: 1;
-            bottom: 125%;
-            left: 50%;
-            transform: translateX(-50%);
-            opacity: 0;
-            transition: opacity 0.3s;
-        }
-        
-        .tooltip:hover .tooltip-text {
-            visibility: visible;
-            opacity: 1;
-        }
-        
-        @media (max-width: 768px) {
-            .container {
-                padding: 1rem;
-            }
-            
-            h1 {
-                font-size: 2rem;
-            }
-            
-            .tabs {
-                flex-wrap: wrap;
-            }
-            
-            .tab {
-                padding: 0.5rem 1rem;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1><i class="fas fa-cube"></i> Python Package Dependency Checker</h1>
-            <p>Analyze and resolve conflicts in your Python package dependencies</p>
-        </header>
-        
-        <div class="card">
-            <div class="card-header">
-                Requirements Input
-            </div>
-            <div class="card-body">
-                <p>Enter your Python package requirements below (one package per line):</p>
-                <textarea id="requirementsText" placeholder="Examples:
-flask==2.2.3
-Werkzeug==2.2.3
-numpy==1.24.2
-pandas==1.5.3
-..."></textarea>
-                
-                <div style="display: flex; gap: 10px;">
-                    <button id="checkButton" class="btn-primary">
-                        <i class="fas fa-check-circle btn-icon"></i> Check Dependencies
-                    </button>
-                    <button id="clearButton" class="btn-primary" style="background-color: var(--gray-600);">
-                        <i class="fas fa-trash-alt btn-icon"></i> Clear
-                    </button>
-                    <button id="loadExampleButton" class="btn-primary" style="background-color: var(--info-color);">
-                        <i class="fas fa-lightbulb btn-icon"></i> Load Example
-                    </button>
-                </div>
-            </div>
-        </div>
-        
-        <div id="loading" class="loading">
-            <div class="loader"></div>
-            <p style="margin-top: 1rem;">Analyzing dependencies... This might take a moment.</p>
-        </div>
-        
-        <div id="result" class="result-section">
-            <h2>Analysis Results</h2>
-            
-            <div id="performanceInfo" class="performance-info">
-                <i class="fas fa-clock"></i>
-                <span>Analysis completed in 0.5 seconds</span>
-            </div>
-            
-            <div class="tabs">
-                <div class="tab active" data-tab="conflicts">
-                    <i class="fas fa-exclamation-triangle"></i> Conflicts
-                    <span id="conflictsCount" class="badge badge-danger">0</span>
-                </div>
-                <div class="tab" data-tab="solutions">
-                    <i class="fas fa-wrench"></i> Suggested Fixes
-                </div>
-                <div class="tab" data-tab="packages">
-                    <i class="fas fa-list"></i> Packages
-                    <span id="packagesCount" class="badge badge-info">0</span>
-                </div>
-                <div class="tab" data-tab="graph">
-                    <i class="fas fa-project-diagram"></i> Dependency Graph
-                </div>
-            </div>
-            
-            <div id="conflictsTab" class="tab-content active">
-                <div id="conflictsList" class="package-list">
-                    <!-- Conflicts will be displayed here -->
-                </div>
-            </div>
-            
-            <div id="solutionsTab" class="tab-content">
-                <div id="suggestedFixResult">
-                    <p>Here's a revised requirements list that might resolve the conflicts:</p>
-                    <div class="fixed-requirements">
-                        <div class="fixed-requirements-header">Fixed Requirements</div>
-                        <pre id="fixedRequirementsList"></pre>
-                        <div class="fixed-requirements-actions">
-                            <button id="copyFixedButton" class="btn-info btn-sm">
-                                <i class="fas fa-copy btn-icon"></i> Copy
-                            </button>
-                            <button id="applyFixedButton" class="btn-success btn-sm">
-                                <i class="fas fa-check btn-icon"></i> Apply Changes
-                            </button>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div id="packagesTab" class="tab-content">
-                <div id="packagesList" class="package-list">
-                    <!-- Packages will be displayed here -->
-                </div>
-            </div>
-            
-            <div id="graphTab" class="tab-content">
-                <div class="graph-container">
-                    <p>This graph shows the relationships between your packages and their dependencies:</p>
-                    <div id="graphImage"></div>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        // Tab functionality
-        document.querySelectorAll('.tab').forEach(tab => {
-            tab.addEventListener('click', () => {
-                // Remove active class from all tabs
-                document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-                document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-                
-                // Add active class to clicked tab
-                tab.classList.add('active');
-                document.getElementById(tab.dataset.tab + 'Tab').classList.add('active');
-            });
-        });
-        
-        // Clear button
-        document.getElementById('clearButton').addEventListener('click', function() {
-            document.getElementById('requirementsText').value = '';
-        });
-        
-        // Load example button
-        document.getElementById('loadExampleButton').addEventListener('click', function() {
-            document.getElementById('requirementsText').value = `Flask==2.2.3
-Werkzeug==1.0.1  # This will conflict with Flask 2.2.3
-requests==2.28.2
-urllib3==2.0.3  # This will conflict with requests
-pandas==1.5.3
-numpy==1.20.3  # This will conflict with pandas`;
-        });
-        
-        // Check dependencies
-        document.getElementById('checkButton').addEventListener('click', function() {
-            const requirementsText = document.getElementById('requirementsText').value;
-            
-            if (!requirementsText.trim()) {
-                alert('Please enter package requirements');
-                return;
-            }
-            
-            // Show loading state
-            document.getElementById('loading').style.display = 'flex';
-            document.getElementById('result').style.display = 'none';
-            
-            // Send request to server
-            const formData = new FormData();
-            formData.append('requirements', requirementsText);
-            
-            fetch('/check_dependencies', {
-                method: 'POST',
-                body: formData
-            })
-            .then(response => response.json())
-            .then(data => {
-                // Hide loading state
-                document.getElementById('loading').style.display = 'none';
-                document.getElementById('result').style.display = 'block';
-                
-                // Display performance info
-                if (data.execution_time) {
-                    document.getElementById('performanceInfo').innerHTML = `
-                        <i class="fas fa-clock"></i>
-                        <span>Analysis completed in ${data.execution_time}</span>
-                    `;
-                }
-                
-                // Update counts
-                document.getElementById('conflictsCount').textContent = data.conflicts ? data.conflicts.length : 0;
-                document.getElementById('packagesCount').textContent = data.requirements ? data.requirements.length : 0;
-                
-                // Show the conflicts tab if conflicts exist
-                if (data.conflicts && data.conflicts.length > 0) {
-                    document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-                    document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-                    document.querySelector('.tab[data-tab="conflicts"]').classList.add('active');
-                    document.getElementById('conflictsTab').classList.add('active');
-                }
-                
-                // Display conflicts
-                const conflictsListEl = document.getElementById('conflictsList');
-                conflictsListEl.innerHTML = '';
-                
-                if (data.conflicts && data.conflicts.length > 0) {
-                    data.conflicts.forEach(conflict => {
-                        const conflictEl = document.createElement('div');
-                        conflictEl.className = `package ${conflict.type || 'conflict'}`;
-                        
-                        // Create conflict header
-                        const headerEl = document.createElement('div');
-                        headerEl.className = 'package-header';
-                        
-                        const nameEl = document.createElement('div');
-                        nameEl.className = 'package-name';
-                        nameEl.innerHTML = `<i class="fas fa-exclamation-circle" style="color: #f44336;"></i> ${conflict.package}`;
-                        
-                        const typeEl = document.createElement('div');
-                        typeEl.className = 'package-type';
-                        typeEl.textContent = conflict.type ? conflict.type.replace('_', ' ') : 'conflict';
-                        
-                        headerEl.appendChild(nameEl);
-                        headerEl.appendChild(typeEl);
-                        
-                        // Create error message
-                        const errorEl = document.createElement('div');
-                        errorEl.className = 'error-message';
-                        errorEl.textContent = conflict.error;
-                        
-                        conflictEl.appendChild(headerEl);
-                        conflictEl.appendChild(errorEl);
-                        
-                        // Add suggestion if available
-                        if (conflict.suggestion) {
-                            const suggestionEl = document.createElement('div');
-                            suggestionEl.className = 'suggestion';
-                            
-                            const suggestionHeaderEl = document.createElement('div');
-                            suggestionHeaderEl.className = 'suggestion-header';
-                            suggestionHeaderEl.innerHTML = '<i class="fas fa-lightbulb"></i> Suggestion';
-                            
-                            const suggestionTextEl = document.createElement('div');
-                            suggestionTextEl.textContent = conflict.suggestion;
-                            
-                            suggestionEl.appendChild(suggestionHeaderEl);
-                            suggestionEl.appendChild(suggestionTextEl);
-                            
-                            conflictEl.appendChild(suggestionEl);
-                        }
-                        
-                        conflictsListEl.appendChild(conflictEl);
-                    });
-                } else {
-                    conflictsListEl.innerHTML = `
-                        <div class="empty-state">
-                            <i class="fas fa-check-circle" style="color: var(--success-color);"></i>
-                            <h3>All Clear!</h3>
-                            <p>No conflicts detected in your requirements.</p>
-                        </div>
-                    `;
-                }
-                
-                // Display packages
-                const packagesListEl = document.getElementById('packagesList');
-                packagesListEl.innerHTML = '';
-                
-                if (data.requirements && data.requirements.length > 0) {
-                    // Create a list of packages analyzed with improved styling
-                    packagesListEl.innerHTML = `
-                        <div class="card">
-                            <div class="card-body">
-                                <pre>${data.requirements.join('\\n')}</pre>
-                            </div>
-                        </div>
-                    `;
-                } else {
-                    packagesListEl.innerHTML = `
-                        <div class="empty-state">
-                            <i class="fas fa-box-open"></i>
-                            <h3>No Packages</h3>
-                            <p>No packages were analyzed.</p>
-                        </div>
-                    `;
-                }
-                
-                // Display fixed requirements if available
-                if (data.fixed_requirements && data.fixed_requirements.length > 0) {
-                    document.getElementById('suggestedFixResult').style.display = 'block';
-                    const fixedRequirementsListEl = document.getElementById('fixedRequirementsList');
-                    fixedRequirementsListEl.textContent = data.fixed_requirements.join('\\n');
-                    
-                    // Copy to clipboard button
-                    document.getElementById('copyFixedButton').addEventListener('click', function() {
-                        navigator.clipboard.writeText(data.fixed_requirements.join('\\n'))
-                            .then(() => {
-                                this.innerHTML = '<i class="fas fa-check btn-icon"></i> Copied!';
-                                setTimeout(() => {
-                                    this.innerHTML = '<i class="fas fa-copy btn-icon"></i> Copy';
-                                }, 2000);
-                            })
-                            .catch(err => alert('Failed to copy: ' + err));
-                    });
-                    
-                    // Apply changes button
-                    document.getElementById('applyFixedButton').addEventListener('click', function() {
-                        document.getElementById('requirementsText').value = data.fixed_requirements.join('\\n');
-                        
-                        // Show notification
-                        const notification = document.createElement('div');
-                        notification.style.position = 'fixed';
-                        notification.style.bottom = '20px';
-                        notification.style.right = '20px';
-                        notification.style.backgroundColor = '#4caf50';
-                        notification.style.color = 'white';
-                        notification.style.padding = '10px 20px';
-                        notification.style.borderRadius = '4px';
-                        notification.style.boxShadow = '0 2px 10px rgba(0, 0, 0, 0.2)';
-                        notification.style.zIndex = '1000';
-                        notification.innerHTML = '<i class="fas fa-check-circle"></i> Changes applied! Click "Check Dependencies" again to verify the fix.';
-                        
-                        document.body.appendChild(notification);
-                        
-                        setTimeout(() => {
-                            notification.remove();
-                        }, 5000);
-                    });
-                } else {
-                    document.getElementById('suggestedFixResult').style.display = 'none';
-                }
-                
-                // Display dependency graph
-                const graphImageEl = document.getElementById('graphImage');
-                graphImageEl.innerHTML = '';
-                
-                if (data.graph_image) {
-                    const img = document.createElement('img');
-                    img.src = 'data:image/png;base64,' + data.graph_image;
-                    img.alt = 'Dependency Graph';
-                    graphImageEl.appendChild(img);
-                } else if (data.graph_error) {
-                    graphImageEl.innerHTML = `
-                        <div class="empty-state">
-                            <i class="fas fa-exclamation-triangle" style="color: var(--warning-color);"></i>
-                            <h3>Graph Generation Error</h3>
-                            <p>${data.graph_error}</p>
-                        </div>
-                    `;
-                } else {
-                    graphImageEl.innerHTML = `
-                        <div class="empty-state">
-                            <i class="fas fa-project-diagram"></i>
-                            <h3>No Graph Available</h3>
-                            <p>No dependency graph could be generated.</p>
-                        </div>
-                    `;
-                }
-            })
-            .catch(error => {
-                document.getElementById('loading').style.display = 'none';
-                
-                // Show error notification
-                const notification = document.createElement('div');
-                notification.style.position = 'fixed';
-                notification.style.bottom = '20px';
-                notification.style.right = '20px';
-                notification.style.backgroundColor = '#f44336';
-                notification.style.color = 'white';
-                notification.style.padding = '10px 20px';
-                notification.style.borderRadius = '4px';
-                notification.style.boxShadow = '0 2px 10px rgba(0, 0, 0, 0.2)';
-                notification.style.zIndex = '1000';
-                notification.innerHTML = `<i class="fas fa-exclamation-circle"></i> Error: ${error.message}`;
-                
-                document.body.appendChild(notification);
-                
-                setTimeout(() => {
-                    notification.remove();
-                }, 5000);
-            });
-        });
-    </script>
-</body>
-</html>
-        ''')
-    
-    app.run(debug=True)
\ No newline at end of file
+    app.run(threaded=True)
@@ -0,0 +1,34 @@
+# Gunicorn configuration: `gunicorn -c gunicorn_conf.py app:app`
+
+import os
+
+def _usable_cpus():
+    """Cores this process may run on (what `nproc` reports), not all cores."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 2
+
+# One worker process per usable core so CPU-bound conflict checks and
+# rendering run in parallel despite the GIL; WEB_CONCURRENCY overrides the
+# count. Each worker serves many concurrent /check_dependencies requests on
+# threads, since most of a request is spent waiting on PyPI.
+workers = int(os.environ.get('WEB_CONCURRENCY', _usable_cpus()))
+threads = 16
+worker_class = 'gthread'
+timeout = 60
+
+# Import the app (networkx, matplotlib, aiohttp, caches) once in the
+# master so forked workers share the loaded modules copy-on-write.
+preload_app = True
+
+def post_fork(server, worker):
+    # SQLite handles must not be shared across fork; diskcache reopens
+    # its connection lazily on first use in the worker.
+    import app
+    app._DISK_CACHE.close()
+    
+    # Pin each worker to its own core so CPU-bound rendering and parsing
+    # stay cache-hot instead of migrating between cores (Linux only)
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[worker.age % len(cpus)]})
@@ -1,4 +1,84 @@
 document.addEventListener('DOMContentLoaded', function() {
+    // The graph is rendered lazily: the first time the Graph tab is opened
+    // for a result, poll /graph/<id> until the job finishes
+    const GRAPH_POLL_INTERVAL = 300;  // ms
+    const GRAPH_POLL_LIMIT = 200;     // give up after ~60 seconds
+    let currentGraphJob = null;
+    let currentGraphUrl = null;  // Set when the graph is a binary image
+    let graphRequested = false;
+    
+    function loadGraph() {
+        if (!currentGraphJob || graphRequested) return;
+        graphRequested = true;
+        
+        if (currentGraphUrl) {
+            renderGraph({ graph_url: currentGraphUrl });
+            return;
+        }
+        
+        document.getElementById('graphImage').innerHTML = `
+            <div class="empty-state">
+                <i class="fas fa-spinner fa-spin"></i>
+                <h3>Rendering Graph</h3>
+                <p>The dependency graph is being generated...</p>
+            </div>
+        `;
+        pollGraph(currentGraphJob);
+    }
+    
+    function pollGraph(jobId, attempt = 0) {
+        if (jobId !== currentGraphJob) return;  // A newer check replaced this one
+        
+        fetch('/graph/' + jobId)
+            .then(response => response.json())
+            .then(result => {
+                if (jobId !== currentGraphJob) return;
+                if (result.status === 'pending') {
+                    if (attempt + 1 >= GRAPH_POLL_LIMIT) {
+                        renderGraph({ graph_error: 'Timed out waiting for the dependency graph.' });
+                    } else {
+                        setTimeout(() => pollGraph(jobId, attempt + 1), GRAPH_POLL_INTERVAL);
+                    }
+                } else {
+                    renderGraph(result);
+                }
+            })
+            .catch(error => {
+                if (jobId === currentGraphJob) renderGraph({ graph_error: error.message });
+            });
+    }
+    
+    function renderGraph(data) {
+        const graphImageEl = document.getElementById('graphImage');
+        graphImageEl.innerHTML = '';
+        
+        if (data.graph_svg) {
+            graphImageEl.innerHTML = data.graph_svg;
+        } else if (data.graph_url) {
+            const img = document.createElement('img');
+            img.alt = 'Dependency Graph';
+            img.onerror = () => renderGraph({ graph_error: 'The dependency graph image could not be loaded.' });
+            img.src = data.graph_url;
+            graphImageEl.appendChild(img);
+        } else if (data.graph_error) {
+            graphImageEl.innerHTML = `
+                <div class="empty-state">
+                    <i class="fas fa-exclamation-triangle" style="color: var(--warning-color);"></i>
+                    <h3>Graph Generation Error</h3>
+                    <p>${data.graph_error}</p>
+                </div>
+            `;
+        } else {
+            graphImageEl.innerHTML = `
+                <div class="empty-state">
+                    <i class="fas fa-project-diagram"></i>
+                    <h3>No Graph Available</h3>
+                    <p>No dependency graph could be generated.</p>
+                </div>
+            `;
+        }
+    }
+    
     // Tab functionality
     document.querySelectorAll('.tab').forEach(tab => {
         tab.addEventListener('click', () => {
@@ -9,6 +89,10 @@ document.addEventListener('DOMContentLoaded', function() {
             // Add active class to clicked tab
             tab.classList.add('active');
             document.getElementById(tab.dataset.tab + 'Tab').classList.add('active');
+            
+            if (tab.dataset.tab === 'graph') {
+                loadGraph();
+            }
         });
     });
     
@@ -186,31 +270,16 @@ numpy==1.20.3  # This will conflict with pandas`;
                 document.getElementById('suggestedFixResult').style.display = 'none';
             }
             
-            // Display dependency graph
-            const graphImageEl = document.getElementById('graphImage');
-            graphImageEl.innerHTML = '';
-            
-            if (data.graph_image) {
-                const img = document.createElement('img');
-                img.src = 'data:image/png;base64,' + data.graph_image;
-                img.alt = 'Dependency Graph';
-                graphImageEl.appendChild(img);
-            } else if (data.graph_error) {
-                graphImageEl.innerHTML = `
-                    <div class="empty-state">
-                        <i class="fas fa-exclamation-triangle" style="color: var(--warning-color);"></i>
-                        <h3>Graph Generation Error</h3>
-                        <p>${data.graph_error}</p>
-                    </div>
-                `;
+            // Display dependency graph, fetched when the Graph tab is opened
+            currentGraphJob = data.graph_job_id || null;
+            currentGraphUrl = data.graph_url || null;
+            graphRequested = false;
+            if (!currentGraphJob) {
+                renderGraph(data);
+            } else if (document.querySelector('.tab[data-tab="graph"]').classList.contains('active')) {
+                loadGraph();
             } else {
-                graphImageEl.innerHTML = `
-                    <div class="empty-state">
-                        <i class="fas fa-project-diagram"></i>
-                        <h3>No Graph Available</h3>
-                        <p>No dependency graph could be generated.</p>
-                    </div>
-                `;
+                document.getElementById('graphImage').innerHTML = '';
             }
         })
         .catch(error => {
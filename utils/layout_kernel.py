@@ -0,0 +1,100 @@
+import importlib.util
+import threading
+
+import numpy as np
+
+# numba is an optional extra (`pip install numba`). It is only imported,
+# and the kernel only compiled, the first time a cyclic graph is laid out,
+# so importing this module and forking workers stay cheap.
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+LAYOUT_ITERATIONS = 50
+LAYOUT_SEED = 42
+
+_compiled_fr_layout = None
+_compile_lock = threading.Lock()
+
+def fr_layout(pos, edges, iters, k):
+    """
+    Fruchterman-Reingold force-directed layout. pos is an (N, 2) array of
+    initial positions, updated in place and returned; edges is an (E, 2)
+    array of node indices; k is the optimal distance between nodes.
+    """
+    n = pos.shape[0]
+    disp = np.zeros_like(pos)
+    temperature = np.float32(0.1)
+    cooling = temperature / np.float32(iters + 1)
+
+    for _ in range(iters):
+        # Repulsion between every pair of nodes
+        for i in range(n):
+            dx_sum = np.float32(0.0)
+            dy_sum = np.float32(0.0)
+            for j in range(n):
+                if i != j:
+                    dx = pos[i, 0] - pos[j, 0]
+                    dy = pos[i, 1] - pos[j, 1]
+                    dist2 = max(dx * dx + dy * dy, np.float32(1e-4))
+                    force = k * k / dist2
+                    dx_sum += dx * force
+                    dy_sum += dy * force
+            disp[i, 0] = dx_sum
+            disp[i, 1] = dy_sum
+
+        # Attraction along edges
+        for e in range(edges.shape[0]):
+            u = edges[e, 0]
+            v = edges[e, 1]
+            dx = pos[u, 0] - pos[v, 0]
+            dy = pos[u, 1] - pos[v, 1]
+            dist = max(np.sqrt(dx * dx + dy * dy), np.float32(1e-2))
+            force = dist / k
+            disp[u, 0] -= dx * force
+            disp[u, 1] -= dy * force
+            disp[v, 0] += dx * force
+            disp[v, 1] += dy * force
+
+        # Move each node by at most the current temperature
+        for i in range(n):
+            length = max(np.sqrt(disp[i, 0] * disp[i, 0] + disp[i, 1] * disp[i, 1]), np.float32(1e-4))
+            step = min(length, temperature) / length
+            pos[i, 0] += disp[i, 0] * step
+            pos[i, 1] += disp[i, 1] * step
+        temperature -= cooling
+
+    return pos
+
+def _kernel():
+    """fr_layout compiled with numba, or the plain Python version without it."""
+    global _compiled_fr_layout
+    if _compiled_fr_layout is None:
+        with _compile_lock:
+            if _compiled_fr_layout is None:
+                if NUMBA_AVAILABLE:
+                    from numba import njit
+                    # Serial on purpose: each gunicorn worker is pinned to one
+                    # core, and numba's parallel thread pool is not fork-safe
+                    # under preload_app. nogil lets concurrent renders lay out
+                    # in parallel; cache=True reuses the compiled code on disk.
+                    _compiled_fr_layout = njit(fastmath=True, cache=True, nogil=True)(fr_layout)
+                else:
+                    _compiled_fr_layout = fr_layout
+    return _compiled_fr_layout
+
+def force_directed_layout(nodes, edges):
+    """
+    Lay out a graph given as a sequence of nodes and (u, v) edges.
+    Returns a dict of node -> (x, y), centred and scaled to [-1, 1].
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    edge_array = np.array([(index[u], index[v]) for u, v in edges], dtype=np.int32).reshape(-1, 2)
+    pos = np.random.default_rng(LAYOUT_SEED).random((len(nodes), 2), dtype=np.float32)
+    k = np.float32(1 / np.sqrt(max(len(nodes), 1)))
+
+    pos = _kernel()(pos, edge_array, LAYOUT_ITERATIONS, k)
+
+    pos -= pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    if scale > 0:
+        pos /= scale
+    return {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
@@ -1,45 +1,289 @@
+import shutil
+import threading
+import queue
+import time
+import concurrent.futures
+from collections import defaultdict
 import networkx as nx
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import base64
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import features as pil_features
+import html
 from io import BytesIO
+from functools import lru_cache
+from utils.layout_kernel import NUMBA_AVAILABLE, force_directed_layout
 
 def create_dependency_graph(dependency_tree):
-    """Create a NetworkX graph from dependency tree data."""
+    """
+    Create a NetworkX graph from dependency tree data.
+    Graphs are cached by their canonical (package, dependencies) key and
+    shared between callers, so the result must be treated as read-only.
+    """
+    tree_key = tuple(sorted(
+        (package_info['package_name'],
+         tuple(sorted(dependency['package_name'] for dependency in package_info.get('dependencies', ()))))
+        for package_info in dependency_tree
+    ))
+    return _build_graph(tree_key)
+
+@lru_cache(maxsize=256)
+def _build_graph(tree_key):
+    """Build the graph for a canonical dependency tree key."""
     G = nx.DiGraph()
     
-    # Add all packages as nodes
-    for package_info in dependency_tree:
-        package_name = package_info['package_name']
-        G.add_node(package_name)
-        
-        # Add dependencies as edges
-        for dependency in package_info.get('dependencies', []):
-            dependency_name = dependency['package_name']
-            G.add_node(dependency_name)
-            G.add_edge(package_name, dependency_name)
+    # Add all packages as nodes, then their dependencies as edges in bulk
+    # (add_edges_from adds the dependency nodes implicitly)
+    G.add_nodes_from(package_name for package_name, _ in tree_key)
+    G.add_edges_from((package_name, dependency_name)
+                     for package_name, dependency_names in tree_key
+                     for dependency_name in dependency_names)
+    
+    return G
+
+# Above this size graphviz's multilevel sfdp is preferred when installed.
+# Otherwise cyclic graphs use the numba force-directed kernel; without
+# numba, spring_layout (pure Python, O(N^2) per step) is only used up to
+# this size and the O(N) circular layout beyond it.
+MAX_SPRING_LAYOUT_NODES = 50
+GRAPHVIZ_AVAILABLE = shutil.which('sfdp') is not None
+
+@lru_cache(maxsize=512)
+def _layout(nodes, edges):
+    """
+    Compute node positions for a graph given as frozensets of nodes and
+    edges, choosing the layout by graph shape and size. Positions are
+    cached per topology and shared between the PNG and SVG renderers, so
+    the result must be treated as read-only.
+    """
+    G = _graph_from_sets(nodes, edges)
+    if G.number_of_nodes() <= 1:
+        return {node: (0.0, 0.0) for node in G}  # Nothing to lay out
     
+    # Dependency graphs are usually DAGs: give each topological generation
+    # its own concentric shell (O(V+E) and deterministic). Only graphs with
+    # cycles fall through to the force-directed layouts.
+    try:
+        return nx.shell_layout(G, nlist=list(nx.topological_generations(G)))
+    except nx.NetworkXUnfeasible:
+        pass
+    
+    if G.number_of_nodes() > MAX_SPRING_LAYOUT_NODES and GRAPHVIZ_AVAILABLE:
+        try:
+            from networkx.drawing.nx_pydot import graphviz_layout
+            return graphviz_layout(G, prog='sfdp')
+        except Exception:
+            pass  # Fall back to the layouts below
+    if NUMBA_AVAILABLE:
+        return force_directed_layout(list(G.nodes()), list(G.edges()))  # Seeded, so reproducible
+    if G.number_of_nodes() <= MAX_SPRING_LAYOUT_NODES:
+        return nx.spring_layout(G, seed=42)  # For reproducibility
+    return nx.circular_layout(G)
+
+def _figure_geometry(node_count):
+    """Scale the canvas with the graph, capped to bound the PNG size."""
+    width = min(12, 8 + node_count / 10)
+    dpi = 100 if node_count <= MAX_SPRING_LAYOUT_NODES else 80
+    return (width, width * 2 / 3), dpi
+
+def _graph_from_sets(nodes, edges):
+    """Rebuild a graph from frozensets of nodes and edges."""
+    G = nx.DiGraph()
+    G.add_nodes_from(sorted(nodes))  # Stable order keeps the layout reproducible
+    G.add_edges_from(sorted(edges))
     return G
 
-def plot_dependency_graph(G):
-    """Plot the dependency graph and return it as a base64 encoded image."""
-    plt.figure(figsize=(12, 8))
+# One standalone Agg figure per thread (no pyplot global state), reused
+# across renders to avoid reallocating its backing buffer every time
+_figure_local = threading.local()
+
+def _thread_figure():
+    if not hasattr(_figure_local, 'figure'):
+        fig = Figure()
+        _figure_local.figure = (fig, FigureCanvasAgg(fig), fig.add_subplot(111))
+    return _figure_local.figure
+
+# Raster output favours payload size and encode speed over sharpness
+IMAGE_DPI = 72
+IMAGE_SAVE_OPTIONS = {
+    'png': {'compress_level': 1},
+    'webp': {'method': 0},
+}
+WEBP_AVAILABLE = pil_features.check('webp')
+
+@lru_cache(maxsize=256)
+def _render_graph(nodes, edges, image_format='png'):
+    """Render a graph given as frozensets of nodes and edges (cached)."""
+    G = _graph_from_sets(nodes, edges)
+    
+    # Draw on the thread's reusable Agg figure, resized for this graph
+    figsize, _ = _figure_geometry(G.number_of_nodes())
+    fig, canvas, ax = _thread_figure()
+    fig.set_dpi(IMAGE_DPI)
+    fig.set_size_inches(figsize)
+    # clear() keeps the axis and tick settings nx.draw changed last time
+    ax.clear()
+    ax.set_axis_on()
+    ax.tick_params(which='both', bottom=True, left=True, labelbottom=True, labelleft=True)
     
     if len(G.nodes()) > 0:
-        pos = nx.spring_layout(G, seed=42)  # For reproducibility
-        nx.draw(G, pos, with_labels=True, node_color='skyblue', node_size=1500, 
+        pos = _layout(nodes, edges)
+        nx.draw(G, pos, ax=ax, with_labels=True, node_color='skyblue', node_size=1500, 
                font_size=10, font_weight='bold', arrows=True, arrowsize=15)
     else:
-        plt.text(0.5, 0.5, "No dependencies to visualize", 
-                 horizontalalignment='center', verticalalignment='center',
-                 fontsize=14)
+        ax.text(0.5, 0.5, "No dependencies to visualize", 
+                horizontalalignment='center', verticalalignment='center',
+                fontsize=14, transform=ax.transAxes)
     
     # Save the plot to a BytesIO object
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    image_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    plt.close()
+    fig.savefig(buffer, format=image_format, dpi=IMAGE_DPI, bbox_inches='tight',
+                pil_kwargs=IMAGE_SAVE_OPTIONS[image_format])
+    return buffer.getvalue()
+
+# Matplotlib renders are funnelled through one thread. It collects requests
+# for up to RENDER_BATCH_WAIT seconds and draws each distinct graph once.
+RENDER_BATCH_SIZE = 16
+RENDER_BATCH_WAIT = 0.02  # seconds
+render_queue = queue.Queue()
+render_thread = None
+_render_thread_lock = threading.Lock()
+
+def _render_worker():
+    while True:
+        batch = [render_queue.get()]
+        deadline = time.monotonic() + RENDER_BATCH_WAIT
+        while len(batch) < RENDER_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(render_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        # Identical graphs in the batch share a single render
+        waiting = defaultdict(list)
+        for key, future in batch:
+            waiting[key].append(future)
+        for key, futures in waiting.items():
+            try:
+                result = _render_graph(*key)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(result)
+
+def _ensure_render_thread():
+    # Started lazily: a thread started before gunicorn forks does not
+    # exist in the workers
+    global render_thread
+    with _render_thread_lock:
+        if render_thread is None or not render_thread.is_alive():
+            render_thread = threading.Thread(target=_render_worker, name='graph-render-batch', daemon=True)
+            render_thread.start()
+
+def plot_dependency_graph(G, image_format='png'):
+    """Plot the dependency graph and return the encoded image bytes."""
+    if G.number_of_nodes() == 0:
+        return _EMPTY_GRAPH_IMAGES[image_format]
+    _ensure_render_thread()
+    future = concurrent.futures.Future()
+    render_queue.put(((frozenset(G.nodes()), frozenset(G.edges()), image_format), future))
+    return future.result()
+
+SVG_NODE_RADIUS = 24
+SVG_MARGIN = 60
+
+@lru_cache(maxsize=256)
+def _render_svg(nodes, edges):
+    """Emit SVG markup for a graph given as frozensets of nodes and edges (cached)."""
+    G = _graph_from_sets(nodes, edges)
+    figsize, dpi = _figure_geometry(G.number_of_nodes())
+    width, height = int(figsize[0] * dpi), int(figsize[1] * dpi)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" font-family="sans-serif">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+        'markerHeight="8" orient="auto-start-reverse"><path d="M0,0L10,5L0,10z" fill="#000"/></marker></defs>',
+        f'<rect width="{width}" height="{height}" fill="#fff"/>'
+    ]
+    
+    if G.number_of_nodes() == 0:
+        parts.append(f'<text x="{width / 2}" y="{height / 2}" text-anchor="middle" '
+                     f'dominant-baseline="middle" font-size="18">No dependencies to visualize</text>')
+        parts.append('</svg>')
+        return ''.join(parts)
+    
+    # Scale layout coordinates into the drawing area (SVG y grows downwards)
+    pos = _layout(nodes, edges)
+    xs = [float(p[0]) for p in pos.values()]
+    ys = [float(p[1]) for p in pos.values()]
+    span_x = (max(xs) - min(xs)) or 1
+    span_y = (max(ys) - min(ys)) or 1
+    
+    def to_px(node):
+        x, y = float(pos[node][0]), float(pos[node][1])
+        if len(pos) == 1:
+            return width / 2, height / 2
+        return (SVG_MARGIN + (x - min(xs)) / span_x * (width - 2 * SVG_MARGIN),
+                SVG_MARGIN + (max(ys) - y) / span_y * (height - 2 * SVG_MARGIN))
     
-    return image_data
\ No newline at end of file
+    coords = {node: to_px(node) for node in G.nodes()}
+    
+    # Edges stop at the target node's border so the arrowhead stays visible
+    for u, v in G.edges():
+        (x1, y1), (x2, y2) = coords[u], coords[v]
+        length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5 or 1
+        x2 -= (x2 - x1) / length * SVG_NODE_RADIUS
+        y2 -= (y2 - y1) / length * SVG_NODE_RADIUS
+        parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                     f'stroke="#000" marker-end="url(#arrow)"/>')
+    
+    for node, (x, y) in coords.items():
+        label = html.escape(str(node))
+        parts.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{SVG_NODE_RADIUS}" fill="skyblue"/>'
+                     f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="middle" dominant-baseline="middle" '
+                     f'font-size="12" font-weight="bold">{label}</text>')
+    
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def render_dependency_svg(G):
+    """Render the dependency graph as an SVG string, without matplotlib."""
+    if G.number_of_nodes() == 0:
+        return _EMPTY_GRAPH_SVG
+    return _render_svg(frozenset(G.nodes()), frozenset(G.edges()))
+
+# The "No dependencies to visualize" placeholders are rendered once at import
+_EMPTY_GRAPH_SVG = _render_svg.__wrapped__(frozenset(), frozenset())
+_EMPTY_GRAPH_IMAGES = {image_format: _render_graph.__wrapped__(frozenset(), frozenset(), image_format)
+                       for image_format in IMAGE_SAVE_OPTIONS
+                       if image_format != 'webp' or WEBP_AVAILABLE}
+
+# Warm up the rest of the drawing pipeline (bold label fonts, node and
+# arrow artists) with one throwaway render, so the first request doesn't
+# pay for it. Bypasses the caches and the render thread, which is started
+# per worker.
+try:
+    _render_graph.__wrapped__(frozenset(('a', 'b')), frozenset([('a', 'b')]))
+except Exception:
+    pass
+
+def render_graph(dependency_tree, graph_format='svg'):
+    """
+    Build and render the dependency graph as JSON response fields:
+    'graph_svg' (default) or 'graph' (node-link JSON), or 'graph_error'
+    if rendering failed. Raster images are served as binary instead,
+    see plot_dependency_graph.
+    """
+    try:
+        G = create_dependency_graph(dependency_tree)
+        if graph_format == 'json':
+            return {'graph': nx.node_link_data(G)}
+        return {'graph_svg': render_dependency_svg(G)}
+    except Exception as e:
+        return {'graph_error': str(e)}
\ No newline at end of file